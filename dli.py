@@ -1,27 +1,29 @@
 #!/usr/bin/env python3
+import time
+_module_start = time.perf_counter()
+
 import os
 import sys
 import argparse
 import configparser
 import glob
 import json
-import subprocess
 import re
-import urllib.request
-import urllib.error
-from html.parser import HTMLParser
 from pathlib import Path
-import ssl
 
 class Depender:
-    def __init__(self):
+    def __init__(self, load=True):
         self.app_dirs = [
             "/usr/share/applications",
             str(Path.home() / ".local/share/applications")
         ]
         self.apps = []
-        self.load_apps()
-        self.browser_profiles = self.detect_browser_profiles()
+        self.browser_profiles = []
+        
+        # The launch path resolves a single entry on demand instead
+        if load:
+            self.load_apps()
+            self.browser_profiles = self.detect_browser_profiles()
     
     def load_apps(self):
         """Load all .desktop files from specified directories"""
@@ -69,7 +71,9 @@ class Depender:
                 'categories': entry.get('Categories', '').split(';') if entry.get('Categories') else [],
                 'file_path': file_path,
                 'is_web_app': entry.get('X-WebApp', 'false').lower() == 'true',
-                'url': entry.get('X-WebApp-URL', '')
+                'url': entry.get('X-WebApp-URL', ''),
+                'path': entry.get('Path', ''),
+                'terminal': entry.get('Terminal', 'false').lower() == 'true'
             }
             
             # Handle variables in Exec field
@@ -197,21 +201,143 @@ class Depender:
                 }
         return None
     
-    def run_app(self, app_name):
+    def resolve_app(self, app_name):
+        """Resolve a single application by name without loading the whole catalog"""
+        if self.apps:
+            for app in self.apps:
+                if app['name'].lower() == app_name.lower() and app['exec']:
+                    return app
+            return None
+        
+        # Look the name up in the index, then confirm against the entry itself.
+        # Entries edited in place don't change the directory mtime, so a miss or
+        # stale hit on a cached index rebuilds it once and looks again.
+        index, rebuilt = self.get_app_index()
+        while True:
+            desktop_file = index.get(app_name.lower())
+            if desktop_file and os.path.isfile(desktop_file):
+                app = self.parse_desktop_file(desktop_file)
+                if app and app['name'].lower() == app_name.lower() and app['exec']:
+                    return app
+            
+            if rebuilt:
+                return None
+            index, rebuilt = self.get_app_index(rebuild=True)
+    
+    def get_app_index(self, rebuild=False):
+        """Get the name to .desktop file index and whether it was just rebuilt; it is rebuilt when an application directory changes"""
+        mtimes = {}
+        for app_dir in self.app_dirs:
+            try:
+                mtimes[app_dir] = os.stat(app_dir).st_mtime_ns
+            except OSError:
+                mtimes[app_dir] = None
+        
+        cache_path = Path.home() / ".cache/depender/app-index.json"
+        if not rebuild:
+            index = self.read_cache(cache_path, 1, mtimes)
+            if index is not None:
+                return index, False
+        
+        # Same order as load_apps, so the first runnable entry with a given name wins
+        index = {}
+        for app_dir in self.app_dirs:
+            if mtimes[app_dir] is None:
+                continue
+            
+            for desktop_file in glob.glob(os.path.join(app_dir, "*.desktop")):
+                app = self.parse_desktop_file(desktop_file)
+                if app and app['exec']:
+                    index.setdefault(app['name'].lower(), desktop_file)
+        
+        self.write_cache(cache_path, 1, mtimes, index)
+        return index, True
+    
+    def read_cache(self, cache_path, version, mtimes):
+        """Read cached data if it matches the version and the source mtimes"""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == version and cache.get('mtimes') == mtimes:
+                return cache['data']
+        except Exception:
+            pass
+        return None
+    
+    def write_cache(self, cache_path, version, mtimes, data):
+        """Atomically write cached data along with its version and source mtimes"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': version, 'mtimes': mtimes, 'data': data}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Warning: Failed to write cache {cache_path}: {str(e)}", file=sys.stderr)
+    
+    def get_terminal_command(self):
+        """Get the terminal command, including its execute flag, for Terminal=true applications"""
+        terminal = self.get_config_value('terminal')
+        if not terminal:
+            terminal = f"{os.environ.get('TERMINAL', 'xterm')} -e"
+        return self.split_exec_command(terminal)
+    
+    def launch_app(self, app):
+        """Spawn a resolved application detached from the current session"""
+        command_parts = self.split_exec_command(app['exec'])
+        if not command_parts:
+            raise ValueError(f"Empty Exec command for '{app['name']}'")
+        
+        if app.get('terminal', False):
+            command_parts = self.get_terminal_command() + command_parts
+        
+        # Redirect stdio so the application does not hold on to our terminal
+        devnull = os.devnull
+        file_actions = [
+            (os.POSIX_SPAWN_OPEN, 0, devnull, os.O_RDONLY, 0),
+            (os.POSIX_SPAWN_OPEN, 1, devnull, os.O_WRONLY, 0),
+            (os.POSIX_SPAWN_OPEN, 2, devnull, os.O_WRONLY, 0)
+        ]
+        
+        # posix_spawn has no working directory option, so switch around the call
+        cwd = None
+        if app.get('path'):
+            cwd = os.getcwd()
+            os.chdir(os.path.expanduser(app['path']))
+        try:
+            return os.posix_spawnp(
+                command_parts[0],
+                command_parts,
+                os.environ,
+                file_actions=file_actions,
+                setsid=True
+            )
+        finally:
+            if cwd is not None:
+                os.chdir(cwd)
+    
+    def run_app(self, app_name, timing=False):
         """Run a specific application"""
-        for app in self.apps:
-            if app['name'].lower() == app_name.lower() and app['exec']:
-                try:
-                    # Split command into parts
-                    command_parts = self.split_exec_command(app['exec'])
-                    
-                    # Run the command
-                    subprocess.Popen(command_parts)
-                    return True
-                except Exception as e:
-                    print(f"Failed to run application: {str(e)}", file=sys.stderr)
-                    return False
-        return False
+        start = time.perf_counter()
+        app = self.resolve_app(app_name)
+        resolved = time.perf_counter()
+        
+        success = False
+        if app and app['exec']:
+            try:
+                self.launch_app(app)
+                success = True
+            except Exception as e:
+                print(f"Failed to run application: {str(e)}", file=sys.stderr)
+        
+        # Report even on failure so slow misses can be measured too
+        if timing:
+            spawned = time.perf_counter()
+            print(f"Startup: {(start - _module_start) * 1000:.2f} ms", file=sys.stderr)
+            print(f"Resolve: {(resolved - start) * 1000:.2f} ms", file=sys.stderr)
+            print(f"Spawn: {(spawned - resolved) * 1000:.2f} ms", file=sys.stderr)
+            print(f"Total: {(spawned - _module_start) * 1000:.2f} ms", file=sys.stderr)
+        return success
     
     def split_exec_command(self, command):
         """Split Exec command into parts while handling quotes"""
@@ -249,52 +375,156 @@ class Depender:
         """Search for applications based on a query"""
         return self.list_apps(search_query=query)
     
+    def get_profile_sources(self):
+        """Get the files that list each browser's profiles"""
+        return [
+            ('Firefox', 'firefox', Path.home() / ".mozilla/firefox/profiles.ini"),
+            ('Chrome', 'google-chrome', Path.home() / ".config/google-chrome/Local State"),
+            ('Chromium', 'chromium', Path.home() / ".config/chromium/Local State")
+        ]
+    
     def detect_browser_profiles(self):
         """Detect available browser profiles for web apps"""
+        sources = self.get_profile_sources()
+        
+        # Only stat the profile lists; the cache is valid while none of them changed
+        mtimes = {}
+        for _, _, source in sources:
+            try:
+                mtimes[str(source)] = source.stat().st_mtime_ns
+            except OSError:
+                mtimes[str(source)] = None
+        
+        cache_path = Path.home() / ".cache/depender/browser-profiles.json"
+        profiles = self.read_cache(cache_path, 2, mtimes)
+        if profiles is not None:
+            return profiles
+        
+        profiles = []
+        for browser, command, source in sources:
+            if mtimes[str(source)] is None:
+                continue
+            try:
+                if browser == 'Firefox':
+                    profiles.extend(self.read_firefox_profiles(source, command))
+                else:
+                    profiles.extend(self.read_chromium_profiles(source, browser, command))
+            except Exception as e:
+                print(f"Warning: Failed to read {browser} profiles from {source}: {str(e)}", file=sys.stderr)
+        
+        self.write_cache(cache_path, 2, mtimes, profiles)
+        return profiles
+    
+    def read_firefox_profiles(self, profiles_ini, command):
+        """Read Firefox profiles from profiles.ini"""
+        config = configparser.ConfigParser(interpolation=None)
+        config.optionxform = str  # Preserve case sensitivity
+        
+        with open(profiles_ini, 'r', encoding='utf-8') as f:
+            config.read_file(f)
+        
+        # Newer Firefox versions record the profile in use per installation
+        install_defaults = {
+            config[section].get('Default', '')
+            for section in config.sections()
+            if section.startswith('Install')
+        }
+        
         profiles = []
+        for section in config.sections():
+            if not section.startswith('Profile'):
+                continue
+            
+            entry = config[section]
+            relative_path = entry.get('Path', '')
+            if not relative_path:
+                continue
+            
+            if entry.get('IsRelative', '1') == '1':
+                path = profiles_ini.parent / relative_path
+            else:
+                path = Path(relative_path)
+            
+            if not self.is_exec_safe(str(path)):
+                print(f"Warning: Skipping Firefox profile with unsupported characters in its path: {path}", file=sys.stderr)
+                continue
+            
+            profiles.append({
+                'name': 'Firefox',
+                'profile': path.name,
+                'display_name': entry.get('Name', path.name),
+                'path': str(path),
+                'default': entry.get('Default', '0') == '1' or relative_path in install_defaults,
+                'command': f'{command} --profile "{path}"'
+            })
+        
+        return profiles
+    
+    def read_chromium_profiles(self, local_state, browser, command):
+        """Read Chrome/Chromium profiles from the Local State file"""
+        with open(local_state, 'r', encoding='utf-8') as f:
+            state = json.load(f)
         
-        # Check Firefox profiles
-        firefox_path = Path.home() / ".mozilla/firefox"
-        if firefox_path.exists():
-            for profile in firefox_path.glob("*.default*"):
-                profiles.append({
-                    'name': 'Firefox',
-                    'profile': profile.name,
-                    'path': str(profile),
-                    'command': 'firefox --profile "{}"'
-                })
-        
-        # Check Chrome profiles
-        chrome_path = Path.home() / ".config/google-chrome"
-        if chrome_path.exists():
-            for profile in chrome_path.glob("Profile *"):
-                profiles.append({
-                    'name': 'Chrome',
-                    'profile': profile.name,
-                    'path': str(profile),
-                    'command': 'google-chrome --profile-directory="{}"'
-                })
-        
-        # Check Chromium profiles
-        chromium_path = Path.home() / ".config/chromium"
-        if chromium_path.exists():
-            for profile in chromium_path.glob("Profile *"):
-                profiles.append({
-                    'name': 'Chromium',
-                    'profile': profile.name,
-                    'path': str(profile),
-                    'command': 'chromium --profile-directory="{}"'
-                })
+        profile_state = state.get('profile', {})
+        last_used = profile_state.get('last_used', 'Default')
+        
+        profiles = []
+        for directory, info in profile_state.get('info_cache', {}).items():
+            if not self.is_exec_safe(directory):
+                print(f"Warning: Skipping {browser} profile with unsupported characters in its name: {directory}", file=sys.stderr)
+                continue
+            
+            profiles.append({
+                'name': browser,
+                'profile': directory,
+                'display_name': info.get('name', directory),
+                'path': str(local_state.parent / directory),
+                'default': directory == last_used,
+                'command': f'{command} --profile-directory="{directory}"'
+            })
         
         return profiles
     
-    def create_web_app(self, url, name=None, icon=None, category="Network"):
+    def is_exec_safe(self, value):
+        """Check that a value can be placed in a double-quoted Exec argument as-is"""
+        # These need Desktop Entry escaping that split_exec_command does not undo,
+        # and % starts a field code that expand_exec_command strips
+        return not any(char in value for char in '"`$\\\n%')
+    
+    def find_browser_profile(self, profile_name):
+        """Find a browser profile by display name or directory name"""
+        matches = [
+            profile for profile in self.browser_profiles
+            if profile_name.lower() in (profile['display_name'].lower(), profile['profile'].lower())
+        ]
+        
+        # Prefer the configured browser when several browsers share a profile name
+        browser = self.get_config_value('browser')
+        browser_names = {'firefox': 'Firefox', 'chrome': 'Chrome', 'chromium': 'Chromium'}
+        for profile in matches:
+            if profile['name'] == browser_names.get(browser):
+                return profile
+        
+        return matches[0] if matches else None
+    
+    def create_web_app(self, url, name=None, icon=None, category="Network", profile=None):
         """Create a web application from a URL"""
         try:
             # Validate URL
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
             
+            # Resolve the browser profile before doing any network work
+            browser_profile = None
+            if profile:
+                browser_profile = self.find_browser_profile(profile)
+                if not browser_profile:
+                    return False, f"Browser profile '{profile}' not found"
+            
+            # Network modules are slow to import, so only load them here
+            import ssl
+            import urllib.request
+            
             # Create a context that ignores SSL verification for problematic sites
             ctx = ssl.create_default_context()
             ctx.check_hostname = False
@@ -309,7 +539,7 @@ class Depender:
                         html_content = response.read().decode('utf-8', errors='ignore')
                     
                     # Parse HTML to extract title and favicon
-                    parser = SimpleHTMLParser()
+                    parser = create_html_parser()
                     parser.feed(html_content)
                     
                     # Get title as name if not provided
@@ -359,7 +589,7 @@ class Depender:
                 f.write("[Desktop Entry]\n")
                 f.write(f"Name={name}\n")
                 f.write(f"Comment=Web application for {url}\n")
-                f.write(f"Exec={self.get_browser_command(url)}\n")
+                f.write(f"Exec={self.get_browser_command(url, browser_profile)}\n")
                 f.write(f"Icon={icon}\n")
                 f.write("Terminal=false\n")
                 f.write("Type=Application\n")
@@ -367,6 +597,8 @@ class Depender:
                 f.write("StartupWMClass=web-app\n")
                 f.write(f"X-WebApp=true\n")
                 f.write(f"X-WebApp-URL={url}\n")
+                if browser_profile:
+                    f.write(f"X-WebApp-Profile={browser_profile['display_name']}\n")
             
             # Reload applications
             self.load_apps()
@@ -375,21 +607,20 @@ class Depender:
         except Exception as e:
             return False, f"Failed to create web application: {str(e)}"
     
-    def get_browser_command(self, url):
+    def get_browser_command(self, url, browser_profile=None):
         """Get the appropriate browser command based on available browsers"""
+        # Launch inside a specific browser profile
+        if browser_profile:
+            return f"{browser_profile['command']} '{url}'"
+        
         # Check for preferred browser in config
-        config_path = Path.home() / ".config/depender/config"
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                for line in f:
-                    if line.startswith('browser='):
-                        browser = line.split('=')[1].strip()
-                        if browser == 'firefox':
-                            return f"firefox '{url}'"
-                        elif browser == 'chrome':
-                            return f"google-chrome '{url}'"
-                        elif browser == 'chromium':
-                            return f"chromium '{url}'"
+        browser = self.get_config_value('browser')
+        if browser == 'firefox':
+            return f"firefox '{url}'"
+        elif browser == 'chrome':
+            return f"google-chrome '{url}'"
+        elif browser == 'chromium':
+            return f"chromium '{url}'"
         
         # Detect available browsers
         browsers = [
@@ -412,6 +643,8 @@ class Depender:
     
     def is_command_available(self, command):
         """Check if a command is available in PATH"""
+        import subprocess
+        
         try:
             subprocess.run(['which', command], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             return True
@@ -460,54 +693,84 @@ class Depender:
         
         return False, f"Application '{app_name}' not found"
     
-    def set_default_browser(self, browser):
-        """Set the default browser for web applications"""
+    def get_config_value(self, key):
+        """Read a single value from the Depender config file"""
+        config_path = Path.home() / ".config/depender/config"
+        if config_path.exists():
+            with open(config_path, 'r') as f:
+                for line in f:
+                    if line.startswith(f'{key}='):
+                        return line.split('=', 1)[1].strip()
+        return None
+    
+    def set_config_value(self, key, value):
+        """Write a single value to the Depender config file, keeping the others"""
         config_dir = Path.home() / ".config/depender"
         config_dir.mkdir(parents=True, exist_ok=True)
         
         config_path = config_dir / "config"
         
-        with open(config_path, 'w') as f:
-            f.write(f"browser={browser}\n")
+        lines = []
+        if config_path.exists():
+            with open(config_path, 'r') as f:
+                lines = [line for line in f if not line.startswith(f'{key}=')]
+        lines.append(f"{key}={value}\n")
         
+        with open(config_path, 'w') as f:
+            f.writelines(lines)
+    
+    def set_default_browser(self, browser):
+        """Set the default browser for web applications"""
+        self.set_config_value('browser', browser)
         return True, f"Default browser set to {browser}"
+    
+    def set_default_terminal(self, terminal):
+        """Set the terminal used for Terminal=true applications"""
+        self.set_config_value('terminal', terminal)
+        return True, f"Default terminal set to {terminal}"
 
-class SimpleHTMLParser(HTMLParser):
-    """Custom HTML parser to extract title and favicon without external dependencies"""
-    def __init__(self):
-        super().__init__()
-        self.title = ""
-        self.favicon = None
-        self.in_title = False
-        self.in_head = False
-    
-    def handle_starttag(self, tag, attrs):
-        # Track if we're in the head section
-        if tag == "head":
-            self.in_head = True
-        
-        # Extract title
-        if tag == "title" and self.in_head:
-            self.in_title = True
-        
-        # Extract favicon
-        if self.in_head and tag == "link":
-            attrs_dict = dict(attrs)
-            rel = attrs_dict.get("rel", "").lower()
+def create_html_parser():
+    """Create an HTML parser, importing html.parser only when a web app needs it"""
+    from html.parser import HTMLParser
+    
+    class SimpleHTMLParser(HTMLParser):
+        """Custom HTML parser to extract title and favicon without external dependencies"""
+        def __init__(self):
+            super().__init__()
+            self.title = ""
+            self.favicon = None
+            self.in_title = False
+            self.in_head = False
+    
+        def handle_starttag(self, tag, attrs):
+            # Track if we're in the head section
+            if tag == "head":
+                self.in_head = True
+        
+            # Extract title
+            if tag == "title" and self.in_head:
+                self.in_title = True
+        
+            # Extract favicon
+            if self.in_head and tag == "link":
+                attrs_dict = dict(attrs)
+                rel = attrs_dict.get("rel", "").lower()
             
-            # Check for common favicon patterns
-            if "icon" in rel or "shortcut icon" in rel:
-                self.favicon = attrs_dict.get("href")
+                # Check for common favicon patterns
+                if "icon" in rel or "shortcut icon" in rel:
+                    self.favicon = attrs_dict.get("href")
     
-    def handle_data(self, data):
-        if self.in_title:
-            self.title += data
+        def handle_data(self, data):
+            if self.in_title:
+                self.title += data
     
-    def handle_endtag(self, tag):
-        if tag == "title":
-            self.in_title = False
-        if tag == "head":
-            self.in_head = False
+        def handle_endtag(self, tag):
+            if tag == "title":
+                self.in_title = False
+            if tag == "head":
+                self.in_head = False
+    
+    return SimpleHTMLParser()
 
 def main():
     parser = argparse.ArgumentParser(description='Depender - Advanced Application Manager for Desind OS')
@@ -527,6 +790,7 @@ def main():
     # run command
     run_parser = subparsers.add_parser('run', help='Run an application')
     run_parser.add_argument('app_name', help='Application name')
+    run_parser.add_argument('-t', '--timing', action='store_true', help='Report startup, resolve and spawn latency')
     
     # search command
     search_parser = subparsers.add_parser('search', help='Search applications')
@@ -551,6 +815,7 @@ def main():
     web_parser.add_argument('-n', '--name', help='Application name (optional)')
     web_parser.add_argument('-i', '--icon', help='Icon path or name (optional)')
     web_parser.add_argument('-g', '--category', default='Network', help='Application category')
+    web_parser.add_argument('-p', '--profile', help='Browser profile name (optional)')
     
     # remove command
     remove_parser = subparsers.add_parser('remove', help='Remove an application')
@@ -564,9 +829,14 @@ def main():
     browser_parser = set_default_subparsers.add_parser('browser', help='Set default browser')
     browser_parser.add_argument('browser', choices=['firefox', 'chrome', 'chromium'], help='Browser to use')
     
+    # set-default terminal command
+    terminal_parser = set_default_subparsers.add_parser('terminal', help='Set terminal for console applications')
+    terminal_parser.add_argument('terminal', help='Terminal command including its execute flag (e.g. "xterm -e", "gnome-terminal --")')
+    
     args = parser.parse_args()
     
-    depender = Depender()
+    # Launching skips the catalog and profile scan entirely
+    depender = Depender(load=args.command != 'run')
     
     if args.command == 'list':
         apps = depender.list_apps(category=args.category, search_query=args.search, web_only=args.web)
@@ -603,7 +873,7 @@ def main():
             print(f"URL: {app_info.get('url', '')}")
     
     elif args.command == 'run':
-        if not depender.run_app(args.app_name):
+        if not depender.run_app(args.app_name, timing=args.timing):
             print(f"Failed to run application '{args.app_name}'.")
             sys.exit(1)
     
@@ -644,7 +914,8 @@ def main():
                 args.url,
                 args.name,
                 args.icon,
-                args.category
+                args.category,
+                args.profile
             )
             if success:
                 print(message)
@@ -668,6 +939,14 @@ def main():
             else:
                 print(f"Error: {message}")
                 sys.exit(1)
+        
+        elif args.setting == 'terminal':
+            success, message = depender.set_default_terminal(args.terminal)
+            if success:
+                print(message)
+            else:
+                print(f"Error: {message}")
+                sys.exit(1)
     
     else:
         parser.print_help()
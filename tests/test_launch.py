@@ -0,0 +1,204 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dli
+
+
+def wait_for(path, timeout=5):
+    """Wait for a spawned process to write its output file"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists() and path.read_text():
+            return path.read_text().strip()
+        time.sleep(0.02)
+    raise AssertionError(f"{path} was not written")
+
+
+class LaunchTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.home = Path(tmp.name)
+
+        env = mock.patch.dict(os.environ, {'HOME': str(self.home)})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.system_dir = self.home / "system"
+        self.local_dir = self.home / ".local/share/applications"
+        self.system_dir.mkdir()
+        self.local_dir.mkdir(parents=True)
+
+        self.depender = dli.Depender(load=False)
+        self.depender.app_dirs = [str(self.system_dir), str(self.local_dir)]
+
+    def write_entry(self, app_dir, filename, name, exec_cmd, extra=""):
+        desktop_file = app_dir / filename
+        desktop_file.write_text(
+            "[Desktop Entry]\n"
+            f"Name={name}\n"
+            f"Exec={exec_cmd}\n"
+            "Type=Application\n"
+            f"{extra}"
+        )
+        return desktop_file
+
+
+class ResolveAppTest(LaunchTestCase):
+    def test_resolves_display_name_that_differs_from_file_name(self):
+        self.write_entry(self.system_dir, "code.desktop", "Visual Studio Code", "code")
+
+        app = self.depender.resolve_app("visual studio code")
+
+        self.assertEqual(app['file_path'], str(self.system_dir / "code.desktop"))
+
+    def test_first_directory_wins(self):
+        self.write_entry(self.system_dir, "editor.desktop", "Editor", "system-editor")
+        self.write_entry(self.local_dir, "editor.desktop", "Editor", "local-editor")
+
+        self.assertEqual(self.depender.resolve_app("Editor")['exec'], "system-editor")
+
+    def test_entry_without_exec_does_not_hide_later_entry(self):
+        self.write_entry(self.system_dir, "editor.desktop", "Editor", "")
+        self.write_entry(self.local_dir, "editor.desktop", "Editor", "local-editor")
+
+        self.assertEqual(self.depender.resolve_app("Editor")['exec'], "local-editor")
+
+    def test_unknown_name(self):
+        self.write_entry(self.system_dir, "code.desktop", "Visual Studio Code", "code")
+
+        self.assertIsNone(self.depender.resolve_app("Nope"))
+
+    def test_index_is_reused_while_directories_are_unchanged(self):
+        self.write_entry(self.system_dir, "code.desktop", "Visual Studio Code", "code")
+        self.depender.resolve_app("Visual Studio Code")
+
+        with mock.patch.object(dli.glob, 'glob', side_effect=AssertionError("directory scanned")):
+            app = self.depender.resolve_app("Visual Studio Code")
+
+        self.assertEqual(app['exec'], "code")
+
+    def test_index_is_rebuilt_when_a_directory_changes(self):
+        self.write_entry(self.system_dir, "code.desktop", "Visual Studio Code", "code")
+        self.assertIsNone(self.depender.resolve_app("Editor"))
+
+        self.write_entry(self.local_dir, "editor.desktop", "Editor", "editor")
+
+        self.assertEqual(self.depender.resolve_app("Editor")['exec'], "editor")
+
+    def test_stale_hit_is_not_returned(self):
+        desktop_file = self.write_entry(self.system_dir, "code.desktop", "Visual Studio Code", "code")
+        self.depender.resolve_app("Visual Studio Code")
+
+        # Rewrite the entry in place and keep the directory mtime unchanged
+        stat = self.system_dir.stat()
+        self.write_entry(self.system_dir, "code.desktop", "Code OSS", "code")
+        os.utime(self.system_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertIsNone(self.depender.resolve_app("Visual Studio Code"))
+        self.assertEqual(self.depender.resolve_app("Code OSS")['file_path'], str(desktop_file))
+
+    def test_name_edited_in_place_is_found(self):
+        desktop_file = self.write_entry(self.system_dir, "code.desktop", "Visual Studio Code", "code")
+        self.depender.resolve_app("Visual Studio Code")
+
+        stat = self.system_dir.stat()
+        self.write_entry(self.system_dir, "code.desktop", "Code OSS", "code")
+        os.utime(self.system_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertEqual(self.depender.resolve_app("Code OSS")['file_path'], str(desktop_file))
+
+    def test_empty_terminal_value_keeps_entry(self):
+        self.write_entry(self.system_dir, "tool.desktop", "Tool", "tool", "Terminal=\n")
+
+        app = self.depender.resolve_app("Tool")
+
+        self.assertFalse(app['terminal'])
+
+
+class LaunchAppTest(LaunchTestCase):
+    def test_path_and_new_session(self):
+        workdir = self.home / "work"
+        workdir.mkdir()
+        out = self.home / "out"
+        script = f"import os; open('{out}', 'w').write(os.getcwd() + ' ' + str(os.getsid(0)))"
+        self.write_entry(self.system_dir, "probe.desktop", "Probe", f'{sys.executable} -c "{script}"', f"Path={workdir}\n")
+
+        cwd = os.getcwd()
+        self.assertTrue(self.depender.run_app("Probe"))
+        self.assertEqual(os.getcwd(), cwd)
+
+        child_cwd, child_sid = wait_for(out).split()
+        self.assertEqual(child_cwd, str(workdir))
+        self.assertNotEqual(int(child_sid), os.getsid(0))
+
+    def write_fake_terminal(self):
+        out = self.home / "terminal-args"
+        terminal = self.home / "fake-terminal"
+        terminal.write_text(f'#!/bin/sh\necho "$@" > "{out}"\n')
+        terminal.chmod(0o755)
+        return terminal, out
+
+    def test_terminal_uses_configured_execute_flag(self):
+        terminal, out = self.write_fake_terminal()
+        self.depender.set_default_terminal(f"{terminal} --")
+        self.write_entry(self.system_dir, "top.desktop", "Top", "top -d 1", "Terminal=true\n")
+
+        self.assertTrue(self.depender.run_app("Top"))
+
+        self.assertEqual(wait_for(out), "-- top -d 1")
+
+    def test_terminal_defaults_to_environment_with_e(self):
+        terminal, out = self.write_fake_terminal()
+        self.write_entry(self.system_dir, "top.desktop", "Top", "top", "Terminal=true\n")
+
+        with mock.patch.dict(os.environ, {'TERMINAL': str(terminal)}):
+            self.assertTrue(self.depender.run_app("Top"))
+
+        self.assertEqual(wait_for(out), "-e top")
+
+
+class TimingTest(LaunchTestCase):
+    def test_timing_is_reported_when_resolve_fails(self):
+        stderr = io.StringIO()
+        with mock.patch('sys.stderr', stderr):
+            self.assertFalse(self.depender.run_app("Nope", timing=True))
+
+        for label in ("Startup:", "Resolve:", "Spawn:", "Total:"):
+            self.assertIn(label, stderr.getvalue())
+
+    def test_import_skips_web_modules(self):
+        code = (
+            "import sys; import dli; "
+            "print(sorted(m for m in ('urllib.request', 'ssl', 'html.parser', 'subprocess') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parent.parent,
+            check=True, capture_output=True, text=True
+        )
+
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+class ConfigTest(LaunchTestCase):
+    def test_setting_a_value_keeps_other_keys(self):
+        self.depender.set_default_browser("firefox")
+        self.depender.set_default_terminal("kitty -e")
+        self.depender.set_default_browser("chromium")
+
+        self.assertEqual(self.depender.get_config_value('browser'), "chromium")
+        self.assertEqual(self.depender.get_config_value('terminal'), "kitty -e")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dli
+
+
+PROFILES_INI = """\
+[Install4F96D1932A9F858E]
+Default=abc.default-release
+
+[Profile0]
+Name=default-release
+IsRelative=1
+Path=abc.default-release
+
+[Profile1]
+Name=Work
+IsRelative=0
+Path=/data/firefox/work
+"""
+
+LOCAL_STATE = {
+    'profile': {
+        'last_used': 'Profile 1',
+        'info_cache': {
+            'Default': {'name': 'Person 1'},
+            'Profile 1': {'name': 'Work'}
+        }
+    }
+}
+
+
+class ProfilesTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.home = Path(tmp.name)
+
+        env = mock.patch.dict(os.environ, {'HOME': str(self.home)})
+        env.start()
+        self.addCleanup(env.stop)
+
+        self.profiles_ini = self.home / ".mozilla/firefox/profiles.ini"
+        self.local_state = self.home / ".config/chromium/Local State"
+        self.profiles_ini.parent.mkdir(parents=True)
+        self.local_state.parent.mkdir(parents=True)
+        self.profiles_ini.write_text(PROFILES_INI)
+        self.local_state.write_text(json.dumps(LOCAL_STATE))
+
+        self.depender = dli.Depender(load=False)
+
+    def detect(self):
+        return {(p['name'], p['profile']): p for p in self.depender.detect_browser_profiles()}
+
+
+class ReadProfilesTest(ProfilesTestCase):
+    def test_firefox_profiles(self):
+        profiles = self.detect()
+
+        release = profiles[('Firefox', 'abc.default-release')]
+        self.assertEqual(release['display_name'], "default-release")
+        self.assertEqual(release['path'], str(self.profiles_ini.parent / "abc.default-release"))
+        self.assertTrue(release['default'])
+
+        work = profiles[('Firefox', 'work')]
+        self.assertEqual(work['path'], "/data/firefox/work")
+        self.assertFalse(work['default'])
+        self.assertEqual(work['command'], 'firefox --profile "/data/firefox/work"')
+
+    def test_chromium_profiles(self):
+        profiles = self.detect()
+
+        default = profiles[('Chromium', 'Default')]
+        self.assertEqual(default['display_name'], "Person 1")
+        self.assertFalse(default['default'])
+        self.assertTrue(profiles[('Chromium', 'Profile 1')]['default'])
+        self.assertEqual(default['command'], 'chromium --profile-directory="Default"')
+
+    def test_unsafe_paths_are_skipped(self):
+        self.profiles_ini.write_text(
+            '[Profile0]\nName=Bad\nIsRelative=0\nPath=/data/$HOME/"x"\n'
+            '[Profile1]\nName=Field\nIsRelative=0\nPath=/data/%f/work\n'
+        )
+        self.local_state.write_text(json.dumps({'profile': {'info_cache': {'Pro`x`': {'name': 'Bad'}, 'Pro%u': {'name': 'Field'}}}}))
+
+        with mock.patch('sys.stderr'):
+            self.assertEqual(self.detect(), {})
+
+    def test_find_prefers_configured_browser(self):
+        self.depender.browser_profiles = self.depender.detect_browser_profiles()
+
+        self.assertEqual(self.depender.find_browser_profile("work")['name'], "Firefox")
+
+        self.depender.set_default_browser("chromium")
+        profile = self.depender.find_browser_profile("work")
+        self.assertEqual(profile['profile'], "Profile 1")
+        self.assertEqual(
+            self.depender.get_browser_command("https://example.com", profile),
+            "chromium --profile-directory=\"Profile 1\" 'https://example.com'"
+        )
+
+
+class ProfileCacheTest(ProfilesTestCase):
+    def test_cache_is_reused_without_reading_sources(self):
+        first = self.depender.detect_browser_profiles()
+
+        with mock.patch.object(self.depender, 'read_firefox_profiles', side_effect=AssertionError("re-read")), \
+                mock.patch.object(self.depender, 'read_chromium_profiles', side_effect=AssertionError("re-read")):
+            self.assertEqual(self.depender.detect_browser_profiles(), first)
+
+    def test_cache_is_invalidated_by_mtime(self):
+        self.detect()
+
+        self.local_state.write_text(json.dumps({'profile': {'info_cache': {'Default': {'name': 'Me'}}}}))
+        stat = self.local_state.stat()
+        os.utime(self.local_state, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        profiles = self.detect()
+        self.assertEqual(profiles[('Chromium', 'Default')]['display_name'], "Me")
+        self.assertNotIn(('Chromium', 'Profile 1'), profiles)
+
+    def test_cache_with_other_version_is_rebuilt(self):
+        self.detect()
+        cache_path = self.home / ".cache/depender/browser-profiles.json"
+        cache = json.loads(cache_path.read_text())
+        cache['version'] = 0
+        cache['data'] = []
+        cache_path.write_text(json.dumps(cache))
+
+        self.assertEqual(len(self.detect()), 4)
+        self.assertEqual(json.loads(cache_path.read_text())['version'], 2)
+        self.assertEqual([p.name for p in cache_path.parent.iterdir()], [cache_path.name])
+
+
+if __name__ == "__main__":
+    unittest.main()